@@ -11,8 +11,10 @@
 # limitations under the License.
 # ===----------------------------------------------------------------------=== #
 
+import math
 import os
 from pathlib import Path
+from typing import Optional
 
 import numpy as np
 from max.driver import CPU, Accelerator, Tensor, accelerator_count
@@ -21,6 +23,92 @@ from max.engine.api import InferenceSession
 from max.graph import Graph, TensorType, ops
 
 
+def create_fused_attention_graph(
+    dtype: DType,
+    N: int,
+    D: int,
+    BN: int,
+    BD: int,
+    causal: bool = False,
+    softmax_scale: Optional[float] = None,
+    target: str = "cpu",
+) -> Graph:
+    """Configure a graph to run a fused attention kernel.
+
+    The shapes `N` and `D` and the tile sizes `BN` and `BD` are forwarded to
+    the kernel as compile-time parameters, so its tile loops are fully
+    specialized for them and the tiles can be chosen per device to fit
+    shared memory.
+    `softmax_scale` defaults to `1 / sqrt(D)`.
+
+    `target` is the device kind the graph will run on, "cpu" or "gpu". The
+    GPU kernel runs its matmuls on tensor cores, so the shapes must also line
+    up with the MMA instruction: BN must equal its M height (16), BD must be
+    a multiple of its N width (8), and N and D multiples of its K width (8
+    for float32, 16 for half-precision types).
+
+    The graph takes and returns float32 tensors. When `dtype` is a
+    half-precision type, Q, K, and V are cast on entry so the kernel's
+    matmuls run on it, while the softmax statistics and the output
+    accumulator stay in float32.
+    """
+    if N % BN or D % BD:
+        msg = f"tiles ({BN}, {BD}) must evenly divide the inputs ({N}, {D})"
+        raise ValueError(msg)
+
+    if target == "gpu":
+        mma_m = 16
+        mma_n = 8
+        mma_k = 8 if dtype == DType.float32 else 16
+        if BN != mma_m:
+            msg = f"BN ({BN}) must be {mma_m} on GPU"
+            raise ValueError(msg)
+        if BD % mma_n:
+            msg = f"BD ({BD}) must be a multiple of {mma_n} on GPU"
+            raise ValueError(msg)
+        if N % mma_k or D % mma_k:
+            msg = f"N ({N}) and D ({D}) must be multiples of {mma_k} on GPU for {dtype}"
+            raise ValueError(msg)
+    elif target != "cpu":
+        msg = f"target must be 'cpu' or 'gpu', got {target!r}"
+        raise ValueError(msg)
+
+    if softmax_scale is None:
+        softmax_scale = 1.0 / math.sqrt(D)
+
+    with Graph(
+        "fused_attention",
+        input_types=[
+            TensorType(DType.float32, shape=[N, D]),
+            TensorType(DType.float32, shape=[N, D]),
+            TensorType(DType.float32, shape=[N, D]),
+        ],
+    ) as graph:
+        q, k, v = (ops.cast(x, dtype) for x in graph.inputs)
+        results = ops.custom(
+            name="fused_attention_custom",
+            parameters={
+                "N": N,
+                "D": D,
+                "BD": BD,
+                "BN": BN,
+                "causal": causal,
+                "accum_dtype": DType.float32,
+            },
+            values=[
+                q,
+                k,
+                v,
+                # Float parameters aren't supported by `ops.custom`, so the
+                # softmax scale is passed as a float32 scalar input instead.
+                ops.constant(softmax_scale, dtype=DType.float32),
+            ],
+            out_types=[TensorType(dtype, shape=[N, D])],
+        )
+        graph.output(ops.cast(results[0], DType.float32))
+        return graph
+
+
 def main():
     # This is necessary only for Modular internal CI.
     if directory := os.getenv("BUILD_WORKSPACE_DIRECTORY"):
@@ -28,38 +116,26 @@ def main():
 
     path = Path(__file__).parent / "kernels.mojopkg"
 
-    dtype = DType.float32
-
     if accelerator_count() == 0:
+        # The CPU kernel uses scalar loops, so stay in float32.
+        dtype = DType.float32
         N = 8
         D = 8
         BD = 4
         BN = 4
     else:
+        # Run the matmuls on bfloat16 tensor cores.
+        dtype = DType.bfloat16
         N = 32
         D = 32
         BD = 8
         BN = 16
 
-    with Graph(
-        "fused_attention",
-        input_types=[
-            TensorType(dtype, shape=[N, D]),
-            TensorType(dtype, shape=[N, D]),
-            TensorType(dtype, shape=[N, D]),
-        ],
-    ) as graph:
-        q, k, v, *_ = graph.inputs
-        results = ops.custom(
-            name="fused_attention_custom",
-            parameters={"N": N, "D": D, "BD": BD, "BN": BN},
-            values=[q, k, v],
-            out_types=[TensorType(dtype, shape=[N, D])],
-        )
-        graph.output(*results)
-
     # Place the graph on a GPU, if available. Fall back to CPU if not.
     device = CPU() if accelerator_count() == 0 else Accelerator()
+    target = "cpu" if accelerator_count() == 0 else "gpu"
+
+    graph = create_fused_attention_graph(dtype, N, D, BN, BD, target=target)
 
     # Set up an inference session for running the graph.
     session = InferenceSession(devices=[device], custom_extensions=path)
@@ -67,10 +143,16 @@ def main():
     # Compile the graph.
     model = session.load(graph)
 
-    np.random.seed(123)
-    Q = Tensor.from_numpy(np.random.randn(N, D).astype("f")).to(device)
-    K = Tensor.from_numpy(np.random.randn(N, D).astype("f")).to(device)
-    V = Tensor.from_numpy(np.random.randn(N, D).astype("f")).to(device)
+    rng = np.random.default_rng(123)
+    Q = Tensor.from_numpy(rng.standard_normal((N, D), dtype=np.float32)).to(
+        device
+    )
+    K = Tensor.from_numpy(rng.standard_normal((N, D), dtype=np.float32)).to(
+        device
+    )
+    V = Tensor.from_numpy(rng.standard_normal((N, D), dtype=np.float32)).to(
+        device
+    )
 
     output = model.execute(Q, K, V)
     print(output)
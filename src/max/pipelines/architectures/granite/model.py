@@ -34,6 +34,16 @@ class GraniteModel(Llama3Model):
         devices: list[Device],
         kv_cache_config: KVCacheConfig,
     ) -> None:
+        logits_scaling = getattr(huggingface_config, "logits_scaling", 1.0)
+
+        if logits_scaling != 1.0:
+            # Multiply by the reciprocal rather than dividing, and set this
+            # before `super().__init__`, which builds the graph.
+            inv_logits_scaling = 1.0 / logits_scaling
+            self.logits_postprocessor = lambda logits: logits * ops.constant(
+                inv_logits_scaling, logits.dtype
+            )
+
         super().__init__(
             pipeline_config,
             session,
@@ -42,10 +52,3 @@ class GraniteModel(Llama3Model):
             devices,
             kv_cache_config,
         )
-
-        logits_scaling = getattr(huggingface_config, "logits_scaling", 1.0)
-
-        if logits_scaling != 1.0:
-            self.logits_processor = lambda logits: logits / ops.constant(
-                logits_scaling, logits.dtype
-            )
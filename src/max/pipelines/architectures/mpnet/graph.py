@@ -83,9 +83,10 @@ class MPNetEmbeddings(Layer):
     def __call__(
         self,
         input_ids: TensorValue,
+        padding_mask: TensorValue,
     ) -> TensorValue:
-        position_ids = _create_position_ids_from_input_ids(
-            input_ids, self.config.pad_token_id
+        position_ids = _create_position_ids_from_padding_mask(
+            padding_mask, self.config.pad_token_id
         )
         inputs_embeds = self.word_embeddings(input_ids)
         position_embeddings = self.position_embeddings(position_ids)
@@ -93,10 +94,10 @@ class MPNetEmbeddings(Layer):
         return self.layer_norm(embeddings)
 
 
-def _create_position_ids_from_input_ids(
-    input_ids: TensorValue, padding_idx: int
+def _create_position_ids_from_padding_mask(
+    padding_mask: TensorValue, padding_idx: int
 ) -> TensorValue:
-    mask = (input_ids != padding_idx).cast(DType.int64)
+    mask = padding_mask.cast(DType.int64)
     incremental_indices = ops.cumsum(mask, axis=1) * mask
     return incremental_indices + padding_idx
 
@@ -498,14 +499,20 @@ class MPNetModel(Layer):
             dtype=dtype,
         )
         self.pool_outputs = pipeline_config.pool_embeddings
+        self.pad_token_id = huggingface_config.pad_token_id
 
     def __call__(
         self,
         input_ids: TensorValue,
-        attention_mask: TensorValue,
     ) -> TensorValue:
+        # Derive the padding mask on device rather than uploading it as a
+        # separate input alongside the tokens. The same comparison feeds both
+        # the position ids and the attention mask.
+        padding_mask = input_ids != self.pad_token_id
+        attention_mask = padding_mask.cast(DType.float32)
         embedding_output = self.embeddings(
             input_ids=input_ids,
+            padding_mask=padding_mask,
         )
         extended_attention_mask = ops.reshape(
             attention_mask, ("batch_size", 1, 1, "seq_len")
@@ -537,26 +544,23 @@ class MPNetModel(Layer):
             return encoded_results
 
 
+def input_types() -> list[TensorType]:
+    """Returns the input types of the graph built by `build_graph`."""
+    input_ids_type = TensorType(DType.int64, shape=["batch_size", "seq_len"])
+    return [input_ids_type]
+
+
 def build_graph(
     pipeline_config: PipelineConfig,
     weights: Weights,
     huggingface_config: AutoConfig,
     dtype: DType,
 ) -> Graph:
-    # Graph input types.
-    input_ids_type = TensorType(DType.int64, shape=["batch_size", "seq_len"])
-    attention_mask_type = TensorType(
-        DType.float32, shape=["batch_size", "seq_len"]
-    )
-
     mpnet = MPNetModel(pipeline_config, weights, huggingface_config, dtype)
 
     # Initialize Graph.
     return Graph(
         "mpnet",
         mpnet,
-        input_types=[
-            input_ids_type,
-            attention_mask_type,
-        ],
+        input_types=input_types(),
     )
@@ -18,6 +18,7 @@ Implementation is based on MPNetModel from the transformers library.
 from __future__ import annotations
 
 import logging
+import math
 import time
 from collections.abc import Sequence
 from typing import cast
@@ -39,7 +40,7 @@ from max.pipelines.dataprocessing import collate_batch
 from max.pipelines.kv_cache import KVCacheInputs, KVCacheParams
 from transformers import AutoConfig
 
-from .graph import build_graph
+from .graph import build_graph, input_types
 
 logger = logging.getLogger("max.pipelines")
 
@@ -51,19 +52,17 @@ class MPNetInputs(ModelInputs):
 
     This class encapsulates the input tensors required for the MPNet model execution:
     - next_tokens_batch: A tensor containing the input token IDs
-    - attention_mask: A tensor containing the extended attention mask
+
+    The attention mask is derived from the padded tokens within the graph.
     """
 
     next_tokens_batch: Tensor
-    attention_mask: Tensor
 
     def __init__(
         self,
         next_tokens_batch: Tensor,
-        attention_mask: Tensor,
     ) -> None:
         self.next_tokens_batch = next_tokens_batch
-        self.attention_mask = attention_mask
         # MPNet does not have KV cache inputs.
         self.kv_cache_inputs = None
 
@@ -88,6 +87,17 @@ class MPNetPipelineModel(PipelineModel[TextContext]):
         )
         self.model = self.load_model(session)
 
+        # Host staging buffer that padded token batches are collated into.
+        # It is reused across calls and only grows when a larger batch is seen.
+        max_seq_len = self.calculate_max_seq_len(
+            pipeline_config, huggingface_config
+        )
+        self._tokens_buffer = np.empty(
+            (pipeline_config.max_batch_size or 1)
+            * self._padded_length(max_seq_len),
+            dtype=np.int64,
+        )
+
     @classmethod
     def get_kv_params(
         cls,
@@ -134,7 +144,6 @@ class MPNetPipelineModel(PipelineModel[TextContext]):
         model_inputs = cast(MPNetInputs, model_inputs)
         model_outputs = self.model.execute(
             model_inputs.next_tokens_batch,
-            model_inputs.attention_mask,
             copy_inputs_to_device=False,
         )
         assert isinstance(model_outputs[0], Tensor)
@@ -148,6 +157,12 @@ class MPNetPipelineModel(PipelineModel[TextContext]):
         # Get tokens and seq_ids.
         tokens = [ctx.next_tokens for ctx in context_batch]
 
+        # Make sure the padded batch fits in the staging buffer.
+        max_len = max(len(t) for t in tokens)
+        size = len(tokens) * self._padded_length(max_len)
+        if self._tokens_buffer.size < size:
+            self._tokens_buffer = np.empty(size, dtype=np.int64)
+
         # Pad tokens for the batch.
         pad_value = getattr(self.huggingface_config, "pad_token_id", 1)
         next_tokens_batch, _ = collate_batch(
@@ -155,20 +170,20 @@ class MPNetPipelineModel(PipelineModel[TextContext]):
             pad_value=pad_value,
             batch_size=len(tokens),
             pad_to_multiple_of=self.pipeline_config.pad_to_multiple_of,
+            out=self._tokens_buffer,
         )
 
-        # Compute attention mask.
-        attention_mask = (next_tokens_batch != pad_value).astype(np.float32)
-
         return MPNetInputs(
             next_tokens_batch=Tensor.from_numpy(next_tokens_batch).to(
                 self.devices[0]
             ),
-            attention_mask=Tensor.from_numpy(attention_mask).to(
-                self.devices[0]
-            ),
         )
 
+    def _padded_length(self, seq_len: int) -> int:
+        """Returns `seq_len` rounded up to the configured padding multiple."""
+        multiple = self.pipeline_config.pad_to_multiple_of
+        return math.ceil(seq_len / multiple) * multiple
+
     def prepare_next_token_inputs(
         self,
         next_tokens: Tensor,
@@ -186,13 +201,28 @@ class MPNetPipelineModel(PipelineModel[TextContext]):
         weights = self.pipeline_config.load_weights()
         self._weights = weights
 
-        if serialized_path := self.pipeline_config.serialized_model_path:
+        # Without an explicit serialized model, fall back to one compiled by
+        # an earlier process for the same configuration, if caching is on.
+        cache_path = None
+        serialized_path = self.pipeline_config.serialized_model_path
+        if not serialized_path:
+            cache_path = self._compiled_model_cache_path(
+                "mpnet", [self.pipeline_config.pool_embeddings]
+            )
+            if cache_path is not None:
+                cached_model = self._load_cached_compiled_model(
+                    session, cache_path, self._weights, input_types()
+                )
+                if cached_model is not None:
+                    return cached_model
+
+        if serialized_path:
             # Hydrate all weights to be referenced by the serialized path.
             weights_registry = {}
             for name, weight in self._weights.items():
                 weights_registry[name] = weight.raw_tensor()
 
-            logger.info("Loading serialized model from ", serialized_path)
+            logger.info("Loading serialized model from %s", serialized_path)
 
             return session.load(
                 serialized_path, weights_registry=weights_registry
@@ -220,4 +250,6 @@ class MPNetPipelineModel(PipelineModel[TextContext]):
             ):
                 logger.info("Exporting serialized model to %s", export_path)
                 model._export_mef(export_path)
+            if cache_path is not None:
+                self._cache_compiled_model(model, cache_path)
             return model
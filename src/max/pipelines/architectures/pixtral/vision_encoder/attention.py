@@ -113,10 +113,14 @@ class Attention(Layer):
         """
 
         batch_size, n_patches = x.shape[0], x.shape[1]
-        # matmul weights
-        xq = self.wq(x)
-        xk = self.wk(x)
-        xv = self.wv(x)
+        # Optimization to compute a single matmul by stacking the q, k and v
+        # projection weights.
+        wqkv = ops.concat((self.wq.weight, self.wk.weight, self.wv.weight))
+        xqkv = x @ wqkv.T
+        proj_dim = self.n_heads * self.head_dim
+        xq, xk, xv = ops.split(
+            xqkv, [proj_dim, proj_dim, proj_dim], axis=xqkv.rank - 1
+        )
 
         xq = ops.reshape(
             xq, [batch_size, n_patches, self.n_heads, self.head_dim]
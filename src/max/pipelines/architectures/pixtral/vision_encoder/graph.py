@@ -42,6 +42,10 @@ def _patch_conv2d(
     """
     # Loaded torch weights shape = torch.Size([1024, 3, 16, 16]).
     # Conv2D expects (height, width, in_channels, out_channels) = [16, 16, 3, 1024].
+    # The permute only touches a constant weight, so it is folded when the
+    # graph is compiled rather than run per image. Lowering the patch conv to
+    # reshape + matmul would need the symbolic image height and width to be
+    # provably divisible by patch_size, which the graph can't express today.
     filter_weights = ops.permute(
         weights.weight.allocate(
             dtype, [out_channels, in_channels, patch_size, patch_size], None
@@ -103,8 +107,9 @@ def _encoder_attention(
     huggingface_config: AutoConfig,
     dtype: DType,
 ) -> Attention:
+    vision_config = huggingface_config.vision_config
     # TODO: Do we need to transpose weights? Not obvious from shapes. Both dims are the same.
-    hidden_dim = huggingface_config.vision_config.hidden_size
+    hidden_dim = vision_config.hidden_size
     wq = _linear(
         dtype,
         hidden_dim,
@@ -131,10 +136,10 @@ def _encoder_attention(
     )
 
     return Attention(
-        n_heads=huggingface_config.vision_config.num_attention_heads,
+        n_heads=vision_config.num_attention_heads,
         dim=hidden_dim,
-        head_dim=huggingface_config.vision_config.head_dim,
-        dropout=huggingface_config.vision_config.attention_dropout,
+        head_dim=vision_config.head_dim,
+        dropout=vision_config.attention_dropout,
         wq=wq,
         wk=wk,
         wv=wv,
@@ -149,37 +154,44 @@ def _transformer(
     huggingface_config: AutoConfig,
     dtype: DType,
 ):
+    vision_config = huggingface_config.vision_config
+    hidden_size = vision_config.hidden_size
+    intermediate_size = vision_config.intermediate_size
     with graph:
-        layers = [
-            TransformerBlock(
-                attention=_encoder_attention(
-                    pipeline_config,
-                    weights.layers[i],
-                    huggingface_config,
-                    dtype,
-                ),
-                mlp=_feed_forward(
-                    dtype,
-                    huggingface_config.vision_config.hidden_size,
-                    huggingface_config.vision_config.intermediate_size,
-                    weights.layers[i],
-                ),
-                attention_norm=_rms_norm(
-                    huggingface_config.vision_config.hidden_size,
-                    1e-5,
-                    weights.layers[i].attention_norm,
-                ),
-                mlp_norm=_rms_norm(
-                    huggingface_config.vision_config.hidden_size,
-                    1e-5,
-                    weights.layers[i].ffn_norm,
-                ),
+        layers = []
+        for i in range(vision_config.num_hidden_layers):
+            # Resolve this layer's weights once and reuse them for every
+            # sub-layer.
+            layer_weights = weights.layers[i]
+            layers.append(
+                TransformerBlock(
+                    attention=_encoder_attention(
+                        pipeline_config,
+                        layer_weights,
+                        huggingface_config,
+                        dtype,
+                    ),
+                    mlp=_feed_forward(
+                        dtype,
+                        hidden_size,
+                        intermediate_size,
+                        layer_weights,
+                    ),
+                    attention_norm=_rms_norm(
+                        hidden_size,
+                        1e-5,
+                        layer_weights.attention_norm,
+                    ),
+                    mlp_norm=_rms_norm(
+                        hidden_size,
+                        1e-5,
+                        layer_weights.ffn_norm,
+                    ),
+                )
             )
-            for i in range(huggingface_config.vision_config.num_hidden_layers)
-        ]
 
         return Transformer(
-            n_heads=huggingface_config.vision_config.num_attention_heads,
+            n_heads=vision_config.num_attention_heads,
             layers=layers,
             dtype=dtype,
         )
@@ -192,24 +204,27 @@ def _vision_encoder(
     huggingface_config: AutoConfig,
     dtype: DType,
 ) -> VisionEncoder:
+    vision_config = huggingface_config.vision_config
+    hidden_size = vision_config.hidden_size
+    patch_size = vision_config.patch_size
+    image_size = vision_config.image_size
     patch_conv = _patch_conv2d(
         dtype,
-        huggingface_config.vision_config.num_channels,
-        huggingface_config.vision_config.patch_size,
-        huggingface_config.vision_config.hidden_size,
+        vision_config.num_channels,
+        patch_size,
+        hidden_size,
         weights.vision_tower.patch_conv,
     )
     ln_pre = _rms_norm(
-        huggingface_config.vision_config.hidden_size,
+        hidden_size,
         1e-5,
         weights.vision_tower.ln_pre,
     )
     patch_rope = RotaryEmbedding2D(
-        dim=huggingface_config.vision_config.hidden_size,
-        n_heads=huggingface_config.vision_config.num_attention_heads,
-        theta=huggingface_config.vision_config.rope_theta,
-        max_patches_per_side=huggingface_config.vision_config.image_size
-        // huggingface_config.vision_config.patch_size,
+        dim=hidden_size,
+        n_heads=vision_config.num_attention_heads,
+        theta=vision_config.rope_theta,
+        max_patches_per_side=image_size // patch_size,
     )
     encoder_transformer = _transformer(
         graph,
@@ -225,6 +240,6 @@ def _vision_encoder(
         patch_positional_embedding=patch_rope,
         transformer=encoder_transformer,
         dtype=dtype,
-        patch_size=huggingface_config.vision_config.patch_size,
-        max_image_size=huggingface_config.vision_config.image_size,
+        patch_size=patch_size,
+        max_image_size=image_size,
     )
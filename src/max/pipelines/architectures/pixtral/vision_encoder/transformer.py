@@ -40,7 +40,20 @@ class MLP(Layer):
     up_proj: Linear
 
     def __call__(self, x: TensorValueLike) -> TensorValue:
-        return self.down_proj((ops.silu(self.gate_proj(x)) * self.up_proj(x)))  # type: ignore
+        # Optimization to compute a single matmul by merging the gate and up
+        # projection weights, so the normalized input is only read once.
+        gate_proj_weight = TensorValue(self.gate_proj.weight)
+        feed_forward_length = gate_proj_weight.shape[0]
+        gate_up_proj_weight = ops.concat(
+            (gate_proj_weight, self.up_proj.weight)
+        )
+        output = TensorValue(x) @ gate_up_proj_weight.T
+        gate_out, up_out = ops.split(
+            output,
+            [feed_forward_length, feed_forward_length],
+            axis=output.rank - 1,
+        )
+        return self.down_proj(ops.silu(gate_out) * up_out)
 
 
 @dataclass
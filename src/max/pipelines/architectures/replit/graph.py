@@ -184,6 +184,16 @@ def _transformer(
         )
 
 
+def _input_types(kv_manager: KVCacheManager) -> list[TensorType]:
+    """Returns the input types of the graph built by `_build_graph`."""
+    tokens_type = TensorType(DType.int64, shape=["total_seq_len"])
+    input_row_offsets_type = TensorType(
+        DType.uint32, shape=["input_row_offsets_len"]
+    )
+    kv_cache_types = kv_manager.input_symbols()[0]
+    return [tokens_type, input_row_offsets_type, *kv_cache_types]
+
+
 def _build_graph(
     pipeline_config: PipelineConfig,
     weights: GGUFWeights,
@@ -192,22 +202,8 @@ def _build_graph(
     huggingface_config: AutoConfig,
     dtype: DType,
 ) -> Graph:
-    # Graph input types.
-    tokens_type = TensorType(DType.int64, shape=["total_seq_len"])
-    input_row_offsets_type = TensorType(
-        DType.uint32, shape=["input_row_offsets_len"]
-    )
-    kv_cache_types = kv_manager.input_symbols()[0]
-
     # Initialize Graph.
-    with Graph(
-        "replit",
-        input_types=[
-            tokens_type,
-            input_row_offsets_type,
-            *kv_cache_types,
-        ],
-    ) as graph:
+    with Graph("replit", input_types=_input_types(kv_manager)) as graph:
         model = _transformer(
             graph,
             pipeline_config,
@@ -44,7 +44,7 @@ from max.pipelines.kv_cache import (
 from max.pipelines.nn.compute_log_probabilities import compute_log_probabilities
 from transformers import AutoConfig
 
-from .graph import _build_graph
+from .graph import _build_graph, _input_types
 
 logger = logging.getLogger("max.pipelines")
 
@@ -85,6 +85,18 @@ class ReplitModel(PipelineModel[TextContext]):
             msg = "Replit currently only supported on gpu."
             raise ValueError(msg)
 
+        # Resolve the KV cache params and max sequence length once; they are
+        # fixed by the configs and used by load_kv_manager and load_model.
+        self._kv_params = self.get_kv_params(
+            pipeline_config,
+            huggingface_config=huggingface_config,
+            n_devices=len(devices),
+            kv_cache_config=kv_cache_config,
+        )
+        self._max_seq_len = self.calculate_max_seq_len(
+            pipeline_config, huggingface_config=huggingface_config
+        )
+
         super().__init__(
             pipeline_config,
             session,
@@ -127,25 +139,43 @@ class ReplitModel(PipelineModel[TextContext]):
         context_batch: Sequence[TextContext],
         kv_cache_inputs: KVCacheInputs | None = None,
     ) -> ReplitInputs:
-        # Get input_row_offsets: start and end position of each batch in the
-        # combined total_seq_len dimension.
-        input_row_offsets = np.cumsum(
-            [0] + [ctx.active_length for ctx in context_batch],
-            dtype=np.uint32,
-        )
-
-        # Create a ragged token vector of length: sum(len(t) for t in tokens).
-        tokens = np.concatenate([ctx.next_tokens for ctx in context_batch])
-
         if kv_cache_inputs is None:
             raise ValueError(
                 "Replit has KV cache inputs, but got None instead."
             )
+
+        total_seq_len = sum(ctx.active_length for ctx in context_batch)
+        if self._tokens_host.size < total_seq_len:
+            self._tokens_host = np.empty(total_seq_len, dtype=np.int64)
+
+        # Fill the ragged token vector and input_row_offsets (start and end
+        # position of each batch in the combined total_seq_len dimension) in
+        # a single pass over the preallocated host buffers.
+        input_row_offsets = self._row_offsets_host[: len(context_batch) + 1]
+        input_row_offsets[0] = 0
+        offset = 0
+        for i, ctx in enumerate(context_batch):
+            next_offset = offset + ctx.active_length
+            self._tokens_host[offset:next_offset] = ctx.next_tokens
+            input_row_offsets[i + 1] = next_offset
+            offset = next_offset
+        tokens = self._tokens_host[:offset]
+
+        if all(ctx.active_length == 1 for ctx in context_batch):
+            # Every context has a single active token, so the row offsets are
+            # just arange(batch_size + 1): reuse the preallocated device
+            # buffer, as in prepare_next_token_inputs.
+            row_offsets = self._input_row_offsets_prealloc[
+                : len(context_batch) + 1
+            ]
+        else:
+            row_offsets = Tensor.from_numpy(input_row_offsets).to(
+                self.devices[0]
+            )
+
         return ReplitInputs(
             tokens=Tensor.from_numpy(tokens).to(self.devices[0]),
-            input_row_offsets=Tensor.from_numpy(input_row_offsets).to(
-                self.devices[0]
-            ),
+            input_row_offsets=row_offsets,
             kv_cache_inputs=kv_cache_inputs,
         )
 
@@ -209,16 +239,9 @@ class ReplitModel(PipelineModel[TextContext]):
         available_cache_memory: int,
     ) -> KVCacheManager:
         return load_kv_manager(
-            params=self.get_kv_params(
-                self.pipeline_config,
-                huggingface_config=self.huggingface_config,
-                n_devices=len(self.devices),
-                kv_cache_config=self.kv_cache_config,
-            ),
+            params=self._kv_params,
             max_batch_size=self.pipeline_config.max_batch_size,
-            max_seq_len=self.calculate_max_seq_len(
-                self.pipeline_config, huggingface_config=self.huggingface_config
-            ),
+            max_seq_len=self._max_seq_len,
             num_layers=self.huggingface_config.n_layers,
             devices=self.devices,
             available_cache_memory=available_cache_memory,
@@ -266,6 +289,16 @@ class ReplitModel(PipelineModel[TextContext]):
             np.arange(self.pipeline_config.max_batch_size + 1, dtype=np.uint32)
         ).to(self.devices[0])
 
+        # Host staging buffers for the ragged tokens and input_row_offsets of
+        # the initial step, filled in place by prepare_initial_token_inputs.
+        self._tokens_host = np.empty(
+            self.pipeline_config.max_batch_size * self._max_seq_len,
+            dtype=np.int64,
+        )
+        self._row_offsets_host = np.empty(
+            self.pipeline_config.max_batch_size + 1, dtype=np.uint32
+        )
+
         # Read in weights.
         weights = self.pipeline_config.load_weights()
         if not isinstance(weights, GGUFWeights):
@@ -274,13 +307,39 @@ class ReplitModel(PipelineModel[TextContext]):
 
         self._weights = weights
 
-        if serialized_path := self.pipeline_config.serialized_model_path:
+        # Without an explicit serialized model, fall back to one compiled by
+        # an earlier process for the same configuration, if caching is on.
+        cache_path = None
+        serialized_path = self.pipeline_config.serialized_model_path
+        if not serialized_path:
+            cache_path = self._compiled_model_cache_path(
+                "replit",
+                [
+                    self.pipeline_config.enable_echo,
+                    self._kv_params.dtype,
+                    self._kv_params.cache_strategy,
+                    self._kv_params.page_size,
+                    self._kv_params.enable_prefix_caching,
+                    self._kv_params.n_devices,
+                ],
+            )
+            if cache_path is not None:
+                cached_model = self._load_cached_compiled_model(
+                    session,
+                    cache_path,
+                    self._weights,
+                    _input_types(self.kv_manager),
+                )
+                if cached_model is not None:
+                    return cached_model
+
+        if serialized_path:
             # Hydrate all weights to be referenced by the serialized path.
             weights_registry = {}
             for name, weight in self._weights.items():
                 weights_registry[name] = weight.raw_tensor()
 
-            logger.info("Loading serialized model from ", serialized_path)
+            logger.info("Loading serialized model from %s", serialized_path)
 
             return session.load(
                 serialized_path, weights_registry=weights_registry
@@ -292,12 +351,7 @@ class ReplitModel(PipelineModel[TextContext]):
             graph = _build_graph(
                 self.pipeline_config,
                 self._weights,
-                self.get_kv_params(
-                    self.pipeline_config,
-                    huggingface_config=self.huggingface_config,
-                    n_devices=len(self.devices),
-                    kv_cache_config=self.kv_cache_config,
-                ),
+                self._kv_params,
                 kv_manager=self.kv_manager,
                 huggingface_config=self.huggingface_config,
                 dtype=self.dtype,
@@ -315,6 +369,8 @@ class ReplitModel(PipelineModel[TextContext]):
             ):
                 logger.info("Exporting serialized model to %s", export_path)
                 model._export_mef(export_path)
+            if cache_path is not None:
+                self._cache_compiled_model(model, cache_path)
             return model
 
     def compute_log_probabilities(
@@ -337,30 +393,75 @@ class ReplitModel(PipelineModel[TextContext]):
                     "Echo was enabled but logits were not returned."
                 )
                 return None
-            logits = model_outputs.logits.to_numpy()
+            # Keep the full logits on device; only the rows of batch items
+            # that echo are copied back below.
+            logits = model_outputs.logits
         assert model_outputs.next_token_logits
-        next_token_logits = model_outputs.next_token_logits.to_numpy()
+
+        # Only copy back what the requested log probabilities will read.
+        needs_echo = any(n > 0 and e for n, e in zip(batch_top_n, batch_echo))
+        needs_next_token_logits = any(
+            n > 0 and not e for n, e in zip(batch_top_n, batch_echo)
+        )
+        if needs_next_token_logits:
+            next_token_logits = model_outputs.next_token_logits.to_numpy()
 
         sampled_tokens = next_tokens.to_numpy()
 
-        # Handle the ragged inputs
-        model_inputs = cast(ReplitInputs, model_inputs)
-        tokens = model_inputs.tokens.to_numpy()
-        input_row_offsets = model_inputs.input_row_offsets.to_numpy()
+        if needs_echo:
+            # Handle the ragged inputs
+            model_inputs = cast(ReplitInputs, model_inputs)
+            tokens = model_inputs.tokens.to_numpy()
+            input_row_offsets = model_inputs.input_row_offsets.to_numpy()
+
+            # The echoed samples for each batch item are its input tokens
+            # shifted left by one, followed by the sampled token. Build them
+            # for the whole ragged batch at once and hand out views.
+            echo_samples = np.empty_like(tokens)
+            echo_samples[:-1] = tokens[1:]
+            echo_samples[input_row_offsets[1:].astype(np.intp) - 1] = (
+                sampled_tokens
+            )
+
+            # Copy the echoed logits back in as few transfers as possible.
+            # When the echoing items fill most of the rows from the first to
+            # the last of them, that whole range is copied at once; otherwise
+            # each run of adjacent echoing items is copied separately.
+            echo_items = [
+                i
+                for i, (n, e) in enumerate(zip(batch_top_n, batch_echo))
+                if n > 0 and e
+            ]
+            offsets = input_row_offsets.tolist()
+            echo_span = offsets[echo_items[-1] + 1] - offsets[echo_items[0]]
+            echo_rows = sum(offsets[i + 1] - offsets[i] for i in echo_items)
+            runs: list[list[int]] = []
+            if 2 * echo_rows >= echo_span:
+                runs.append(echo_items)
+            else:
+                for i in echo_items:
+                    if runs and runs[-1][-1] == i - 1:
+                        runs[-1].append(i)
+                    else:
+                        runs.append([i])
+
+            echo_logits: dict[int, np.ndarray] = {}
+            for run in runs:
+                run_start = offsets[run[0]]
+                run_logits = logits[run_start : offsets[run[-1] + 1]].to_numpy()
+                for i in run:
+                    echo_logits[i] = run_logits[
+                        offsets[i] - run_start : offsets[i + 1] - run_start
+                    ]
 
         def _get_logits_and_samples(
             batch_index: int, echo: bool
         ) -> tuple[np.ndarray, np.ndarray]:
             if echo:
-                start_offset = input_row_offsets[batch_index]
-                end_offset = input_row_offsets[batch_index + 1]
-                batch_logits = logits[start_offset:end_offset]
-                samples = np.concatenate(
-                    (
-                        tokens[start_offset + 1 : end_offset],
-                        sampled_tokens[batch_index : batch_index + 1],
-                    )
-                )
+                batch_logits = echo_logits[batch_index]
+                samples = echo_samples[
+                    offsets[batch_index] : offsets[batch_index + 1]
+                ]
             else:
                 batch_logits = next_token_logits[batch_index : batch_index + 1]
                 samples = sampled_tokens[batch_index : batch_index + 1]
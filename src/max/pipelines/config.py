@@ -690,6 +690,11 @@ class PipelineConfig(MAXConfig):
     save_to_serialized_model_path: Optional[str] = None
     """If specified, tries to save a serialized model to this path."""
 
+    cache_compiled_model: bool = False
+    """If True, caches the compiled model on disk and reuses it on later runs
+    with the same configuration. Only used when no serialized model path is
+    given."""
+
     max_length: Optional[int] = None
     """Maximum sequence length of the model."""
 
@@ -1110,6 +1115,7 @@ class PipelineConfig(MAXConfig):
             "quantization_encoding": "Define the weight encoding type for quantization. This can help optimize performance and memory usage during inference. ie. q4_k, bfloat16 etc.",
             "serialized_model_path": "If specified, this flag attempts to load a serialized MEF model from the given path. This is useful for reusing previously saved models.",
             "save_to_serialized_model_path": "If specified, this flag attempts to save the current model state to a serialized format at the given path for later use.",
+            "cache_compiled_model": "Whether to cache the compiled model under the user cache directory and reuse it on later runs with the same model, weights, devices, and MAX version. This defaults to false.",
             "max_length": "Set the maximum sequence length for input data processed by the model. This must be less than the value specified in the Hugging Face configuration file. The default is derived from the Hugging Face configuration value. Larger values may consume more memory.",
             "max_new_tokens": "Specify the maximum number of new tokens to generate during a single inference pass of the model. Default is -1, which means the model will generate until the maximum sequence length is hit, or and eos token is generated.",
             "max_batch_size": "Define the maximum cache size reserved for a single batch. This value defaults to 1. Increase this value based on server capacity when deploying in production.",
@@ -35,6 +35,7 @@ def collate_batch(
     pad_value: int = 0,
     batch_size: int | None = None,
     pad_to_multiple_of: int = 1,
+    out: np.ndarray | None = None,
 ) -> tuple[np.ndarray, np.ndarray]:
     """Generates a single batch tensor from a batch of inputs.
 
@@ -44,13 +45,17 @@ def collate_batch(
     If `batch_size` is present, add additional values to the batch up to that
     size.
 
+    If `out` is present, the padded batch is written into the leading elements
+    of this contiguous buffer rather than a newly allocated array, and the
+    returned matrix is a view into it.
+
     Returns:
         A tuple of:
             A matrix with all rows padded to the max sequence length.
             A list with last token indices prior to any padding.
 
     Raises:
-        ValueError: if the batch is empty.
+        ValueError: if the batch is empty, or `out` is too small to hold it.
         NotImplementedError: if the batch contains anything other than vectors.
     """
     if not batch:
@@ -70,13 +75,6 @@ def collate_batch(
     else:
         pad_to = math.ceil(max_len / pad_to_multiple_of) * pad_to_multiple_of
 
-    def pad(a: np.ndarray) -> np.ndarray:
-        npad = pad_to - len(a)
-        if npad == 0:
-            return a
-        padding = (npad, 0) if direction == PaddingDirection.LEFT else (0, npad)
-        return np.pad(a, padding, mode="constant", constant_values=pad_value)
-
     if batch_size is not None:
         pad_batch_item = np.array([pad_value] * pad_to)
         batch.extend([pad_batch_item] * (batch_size - len(batch)))
@@ -88,7 +86,23 @@ def collate_batch(
         else np.array([len(a) - 1 for a in batch])
     )
 
-    return np.stack([pad(a) for a in batch], axis=0), unpadded_last_token_index
+    # Pad the whole batch in one fill and copy each item into its row, rather
+    # than padding items one by one and stacking the results.
+    size = len(batch) * pad_to
+    if out is None:
+        out = np.empty(size, dtype=np.result_type(*{a.dtype for a in batch}))
+    elif out.size < size:
+        msg = f"Output buffer of size {out.size} cannot hold a {len(batch)}x{pad_to} batch."
+        raise ValueError(msg)
+
+    padded = out.reshape(-1)[:size].reshape(len(batch), pad_to)
+    padded.fill(pad_value)
+    for row, a in zip(padded, batch):
+        if direction == PaddingDirection.LEFT:
+            row[pad_to - len(a) :] = a
+        else:
+            row[: len(a)] = a
+    return padded, unpadded_last_token_index
 
 
 def batch_padded_tokens_and_mask(
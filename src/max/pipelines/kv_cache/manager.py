@@ -17,6 +17,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from functools import cached_property
 from typing import (
     Any,
     Iterator,
@@ -32,7 +33,7 @@ from typing import (
 import numpy as np
 from max.driver import Device, Tensor
 from max.dtype import DType
-from max.engine import InferenceSession
+from max.engine import InferenceSession, Model
 from max.graph import DeviceRef, Graph, TensorType, TensorValue
 from typing_extensions import TypeGuard
 
@@ -77,7 +78,11 @@ class KVCacheInputs:
         """Iterates through each Type in order."""
         for field in self.__dataclass_fields__:
             value = getattr(self, field)
-            if isinstance(value, KVCacheInputs):
+            # Most fields are plain tensors, so check for those first and
+            # skip the more expensive Sequence check below.
+            if isinstance(value, Tensor):
+                yield value
+            elif isinstance(value, KVCacheInputs):
                 yield from value
             elif _is_sequence_of(value, KVCacheInputs):
                 for item in value:
@@ -101,7 +106,9 @@ class KVCacheInputs:
         # elements.
         for field in self.__dataclass_fields__:
             value = getattr(self, field)
-            if _is_sequence_of(value, KVCacheInputs):
+            if isinstance(value, Tensor):
+                count += 1
+            elif _is_sequence_of(value, KVCacheInputs):
                 count += sum(len(x) for x in value)
             else:
                 count += 1
@@ -198,13 +205,20 @@ class KVCacheManager(ABC):
         self.cache_lengths: dict[int, int] = {}
 
         self.is_ragged = is_ragged
-        increment_cache_lengths_graph = (
-            self._create_increment_cache_lengths_graph()
-        )
-        self.increment_cache_lengths_model = session.load(
-            increment_cache_lengths_graph
-        )
-        self.fetch_metadata: dict[int, _FetchMetadata] = {}
+        # Sequence ids are slots in [0, max_batch_size), so index the fetch
+        # metadata by id instead of keying a dict.
+        self.fetch_metadata: list[_FetchMetadata | None] = [
+            None
+        ] * self.max_batch_size
+
+    @cached_property
+    def increment_cache_lengths_model(self) -> Model:
+        """The compiled graph used by `increment_cache_lengths`.
+
+        This is only needed for multistep execution, so it is built and
+        loaded on first use rather than when the manager is constructed.
+        """
+        return self.session.load(self._create_increment_cache_lengths_graph())
 
     @classmethod
     @abstractmethod
@@ -259,7 +273,7 @@ class KVCacheManager(ABC):
 
         # Update the fetch metadata for the given sequence ids and prompts.
         for seq_id, prompt in seq_ids_and_prompts.items():
-            assert seq_id not in self.fetch_metadata
+            assert self.fetch_metadata[seq_id] is None
             self.fetch_metadata[seq_id] = _FetchMetadata(
                 prompt=prompt,
                 num_steps=num_steps,
@@ -321,9 +335,9 @@ class KVCacheManager(ABC):
             if seq_id not in self.cache_lengths:
                 raise ValueError(f"seq_id: {seq_id} not in cache.")
 
-            assert seq_id in self.fetch_metadata
             metadata = self.fetch_metadata[seq_id]
-            del self.fetch_metadata[seq_id]
+            assert metadata is not None
+            self.fetch_metadata[seq_id] = None
 
             assert metadata.num_steps == len(new_tokens)
             self.cache_lengths[seq_id] += (
@@ -407,33 +421,26 @@ class KVCacheManager(ABC):
         Returns:
             Updated cache input tuples with incremented lengths.
         """
-        blocks = [kv_cache_inputs[i].blocks for i in range(len(self.devices))]
-        cache_lengths = [
-            kv_cache_inputs[i].cache_lengths for i in range(len(self.devices))
-        ]
-        lookup_table = [
-            kv_cache_inputs[i].lookup_table for i in range(len(self.devices))
-        ]
-
-        # max_lengths is host allocated and the same across all devices.
-        max_lengths = kv_cache_inputs[0].max_lengths
+        num_devices = len(self.devices)
 
         # Update the cache_lengths of our batch by the previous sequence length.
         updated_cache_lengths = self.increment_cache_lengths_model.execute(
-            prev_model_inputs.input_row_offsets, *cache_lengths
+            prev_model_inputs.input_row_offsets,
+            *(kv_cache_inputs[i].cache_lengths for i in range(num_devices)),
         )
 
+        # max_lengths is host allocated and the same across all devices.
         # Advance to the next step of the max_lengths tensor.
-        updated_max_lengths = max_lengths[1:, :]
+        updated_max_lengths = kv_cache_inputs[0].max_lengths[1:, :]
 
         # Return our updated batch.
-        for i in range(len(self.devices)):
+        for i in range(num_devices):
             updated_cache_length = updated_cache_lengths[i]
             assert isinstance(updated_cache_length, Tensor)
             kv_cache_inputs[i] = RaggedKVCacheInputs(
-                blocks=blocks[i],
+                blocks=kv_cache_inputs[i].blocks,
                 cache_lengths=updated_cache_length,
-                lookup_table=lookup_table[i],
+                lookup_table=kv_cache_inputs[i].lookup_table,
                 max_lengths=updated_max_lengths,
             )
         return kv_cache_inputs
@@ -509,27 +516,29 @@ class KVCacheManager(ABC):
         ) as graph:
             inp_row_offset, *cache_lengths = graph.inputs
             assert isinstance(inp_row_offset, TensorValue)
-            # broadcast the inp_row_offset to all devices (naive)
-            # get rid of this if statement after #51465 merges
-            if len(self.devices) > 1:
-                input_row_offsets = [
-                    inp_row_offset.to(DeviceRef(d.label, d.id))
-                    for d in self.devices
-                ]
-            else:
-                input_row_offsets = [inp_row_offset]
+            assert isinstance(cache_lengths[0], TensorValue)
+
+            # Compute the per-sequence increment once on the device holding
+            # the row offsets, rather than slicing and subtracting on each.
+            right_slice = inp_row_offset[1:].rebind(cache_lengths[0].shape)
+            left_slice = inp_row_offset[: inp_row_offset.shape[0] - 1].rebind(
+                cache_lengths[0].shape
+            )
+            increment_amount = right_slice - left_slice
+
             outputs = []
-            for i in range(len(self.devices)):
+            for i, device in enumerate(self.devices):
                 cache_length = cache_lengths[i]
                 assert isinstance(cache_length, TensorValue)
-                right_slice = input_row_offsets[i][1:].rebind(
-                    cache_length.shape
-                )
-                left_slice = input_row_offsets[i][
-                    : input_row_offsets[i].shape[0] - 1
-                ].rebind(cache_length.shape)
-                increment_amount = right_slice - left_slice
-                outputs.append(cache_length + increment_amount)
+                # broadcast the increment to the other devices (naive)
+                # get rid of this after #51465 merges
+                if i > 0:
+                    device_increment = increment_amount.to(
+                        DeviceRef(device.label, device.id)
+                    )
+                else:
+                    device_increment = increment_amount
+                outputs.append(cache_length + device_increment)
             graph.output(*outputs)
 
         return graph
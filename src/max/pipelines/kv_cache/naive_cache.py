@@ -167,19 +167,19 @@ class NaiveKVCacheManager(KVCacheManager):
                 f"seq_id: {seq_id} would overrun the max cache length of {self.max_seq_len} "
                 f"with {len(prompt)} new tokens and {num_steps} steps. Existing length: {self.cache_lengths[seq_id]}"
             )
+        # The naive cache keeps a single start position for the whole batch.
+        start_pos = self.max_sequence_length
         padded_kv_cache_inputs = [
             PaddedKVCacheInputs(
                 k_cache=self.keys,
                 v_cache=self.values,
                 start_pos=Tensor.scalar(
-                    self.max_sequence_length, DType.int64, self.devices[0]
+                    start_pos, DType.int64, self.devices[0]
                 ),
                 # TODO: MSDK-1201 - This next variable is not used upstream.
                 # It is included here, as a placeholder, until we can dynamically
                 # return a number of tensors from both `fetch` and `input_symbols`.
-                null_op=Tensor.scalar(
-                    self.max_sequence_length, DType.int64, self.devices[0]
-                ),
+                null_op=Tensor.scalar(start_pos, DType.int64, self.devices[0]),
             )
         ]
         return cast(List[KVCacheInputs], padded_kv_cache_inputs)
@@ -521,14 +521,14 @@ class PagedKVCacheManager(KVCacheManager):
         for batch_idx, (seq_id, prompt) in enumerate(
             seq_ids_and_prompts.items()
         ):
-            # Validate there aren't other inflight requests for this sequence.
-            assert seq_id not in self.fetch_metadata
-
             # Add prompt and inflight tokens to the token array
             if seq_id not in self.active_requests:
                 raise ValueError(
                     f"Called fetch on seq_id {seq_id} without claiming it"
                 )
+
+            # Validate there aren't other inflight requests for this sequence.
+            assert self.fetch_metadata[seq_id] is None
             data = self.active_requests[seq_id]
             data.fetch(prompt, num_steps)
 
@@ -631,8 +631,7 @@ class PagedKVCacheManager(KVCacheManager):
                 data.blocks.append(next_block)
 
             # Populate the lookup table with the new pages.
-            for i, block_idx in enumerate(data.blocks):
-                lut_table_np[batch_idx, i] = block_idx
+            lut_table_np[batch_idx, : len(data.blocks)] = data.blocks
 
         # Build a tensor of maximum lengths. Each step slices the first row to
         # advance to the values for the next row.
@@ -17,6 +17,10 @@ from __future__ import annotations
 
 import numpy as np
 
+# Initial capacity of the token array. It grows geometrically up to
+# max_seq_len, so short sequences don't allocate for the full context.
+_INITIAL_TOKENS_CAPACITY = 4096
+
 
 def ceildiv(n: int, d: int) -> int:
     """Compute ceil(n/d) using strictly integer arithmetic."""
@@ -55,12 +59,17 @@ class PagedCacheMetadata:
 
     def __init__(self, page_size: int, max_seq_len: int) -> None:
         self.page_size = page_size
+        self.max_seq_len = max_seq_len
         self.committed_idx: int = 0
         self.cached_idx: int = 0
         self.inflight_idx: int = 0
         self.seq_len: int = 0
         self.blocks: list[int] = []
-        self.tokens: np.ndarray = np.empty((max_seq_len,), dtype=np.int64)
+        # Token ids fit in 32 bits, and these are only used on the host for
+        # prefix matching.
+        self.tokens: np.ndarray = np.empty(
+            (min(max_seq_len, _INITIAL_TOKENS_CAPACITY),), dtype=np.int32
+        )
 
     @property
     def committed_blocks(self) -> list[int]:
@@ -138,7 +147,7 @@ class PagedCacheMetadata:
             <= self.inflight_idx
             <= self.seq_len
         ), "The indices must be in the correct order"
-        assert self.seq_len <= len(self.tokens), (
+        assert self.seq_len <= self.max_seq_len, (
             "Sequence has exceeded the max sequence length"
         )
         assert self.committed_idx % self.page_size == 0, (
@@ -146,6 +155,16 @@ class PagedCacheMetadata:
             "can't commit a partial page into the prefix cache"
         )
 
+    def _reserve(self, size: int) -> None:
+        """Grows the token array so that it holds at least `size` tokens."""
+        capacity = len(self.tokens)
+        if size <= capacity:
+            return
+        new_capacity = max(size, min(2 * capacity, self.max_seq_len))
+        tokens = np.empty((new_capacity,), dtype=self.tokens.dtype)
+        tokens[: self.seq_len] = self.tokens[: self.seq_len]
+        self.tokens = tokens
+
     def fetch(self, prompt: np.ndarray, num_steps: int) -> None:
         """Add prompt to token array and reserve space for inflight tokens."""
         self._validate_indices()
@@ -159,6 +178,7 @@ class PagedCacheMetadata:
             "The prompt provided to fetch should be non-empty"
         )
         num_inflight_tokens = num_steps - 1
+        self._reserve(self.seq_len + len(prompt) + num_inflight_tokens)
         self.inflight_idx += len(prompt)
         self.seq_len += len(prompt) + num_inflight_tokens
         self.tokens[self.cached_idx : self.inflight_idx] = prompt
@@ -91,14 +91,17 @@ class PrefixCache:
         enable_cow: bool = True,
     ):
         self.page_size = page_size
-        self.enable_cow = enable_cow
+        # COW copies part of a page, so it is a no-op when page_size is 1.
+        # Fold that into the flag once here rather than re-checking it on
+        # every fetch.
+        self.enable_cow = enable_cow and page_size > 1
         self.radix_trie = RadixTrie(page_size=self.page_size)
         self.tensors = tensors
 
         self.cow_count = 0
         # List of (block_dst, block_src, num_tokens)
         self.cow_enqueued_args: list[tuple[int, int, int]] = []
-        if self.enable_cow and self.page_size > 1:
+        if self.enable_cow:
             # Load single op graph for performing memory transfers needed for COW
             self.cow_strided_memcpy_graph = session.load(
                 construct_cow_strided_memcpy_graph(
@@ -277,7 +280,7 @@ class PrefixCache:
         # Update the cache hit rate metrics.
         num_cache_hit_tokens = len(prefix_blocks) * self.page_size
         self.cache_hit_tokens += num_cache_hit_tokens
-        self.all_tokens += len(data.committable_tokens) - 1
+        self.all_tokens += data.inflight_idx - data.committed_idx - 1
 
         # Exit early if there are no cache hits.
         if len(prefix_blocks) == 0:
@@ -333,7 +336,11 @@ class PrefixCache:
         committable_tokens = committable_tokens[:-1]
         if len(committable_tokens) == 0:
             return None, 0
-        committable_tokens_cropped = list(committable_tokens[: self.page_size])
+        # tolist() yields plain ints for the SimpleTrie walk, matching the
+        # radix trie's child keys.
+        committable_tokens_cropped = committable_tokens[
+            : self.page_size
+        ].tolist()
         res = node.find_block_with_largest_common_prefix(
             committable_tokens_cropped
         )
@@ -376,10 +383,6 @@ class PrefixCache:
         prompt will be trimmed in the event that cached_idx is bumped.
         """
         assert self.enable_cow
-
-        # If page_size is 1, there is no need to perform COW
-        if self.page_size == 1:
-            return
         assert self.cow_strided_memcpy_graph is not None
 
         committable_tokens = data.committable_tokens
@@ -418,7 +421,7 @@ class PrefixCache:
         This launches 1 kernel even if we need N strided memcpys.
         """
 
-        if not (self.enable_cow and self.page_size > 1):
+        if not self.enable_cow:
             return
         assert self.cow_strided_memcpy_graph is not None
 
@@ -462,7 +465,7 @@ class PrefixCache:
 
         # If COW is enabled, we should consider the number of additional cache
         # hits that would be incurred by performing a COW operation.
-        if self.enable_cow and self.page_size > 1:
+        if self.enable_cow:
             committable_tokens = data.committable_tokens
             committable_tokens = committable_tokens[num_cache_hit_tokens:]
             partial_tokens = data.cached_idx - data.committed_idx
@@ -501,6 +504,12 @@ class PrefixCache:
         number of uncommitted tokens will always be less than the page size.
         """
         committable_tokens = data.committable_tokens_aligned
+        # Most decode steps don't complete a page. With nothing to commit,
+        # the match and insert below would both leave the cursor unchanged,
+        # so skip both trie traversals.
+        if len(committable_tokens) == 0:
+            return
+
         node = self.active_requests[seq_id]
         node, existing_blocks = self.radix_trie.match_prefix(
             committable_tokens, node=node
@@ -54,7 +54,9 @@ def _token_to_key(tokens: np.ndarray, page_size: int) -> tuple[TokenId, ...]:
     assert len(tokens) >= page_size, (
         f"tokens must be at least page_size ({page_size}) long but is only {len(tokens)} tokens"
     )
-    return tuple(tokens[:page_size])
+    # Convert through tolist() so that the key holds plain Python ints, which
+    # are much cheaper to build, hash, and compare than NumPy scalars.
+    return tuple(tokens[:page_size].tolist())
 
 
 class TrieNode:
@@ -65,6 +67,18 @@ class TrieNode:
       for a given token. I.e: the page index
     """
 
+    # A trie holds one node per cached run of pages, so skip the per-instance
+    # __dict__.
+    __slots__ = (
+        "node_id",
+        "children",
+        "tokens",
+        "blocks",
+        "parent",
+        "active_seqs",
+        "key_trie",
+    )
+
     node_id_counter = 0
 
     def __init__(self) -> None:
@@ -392,7 +406,7 @@ class RadixTrie:
                 break
             curr.active_seqs.add(seq_id)
             if not curr.is_evictable():
-                self.evictable_blocks -= set(curr.blocks)
+                self.evictable_blocks.difference_update(curr.blocks)
                 if curr.node_id in self.lru_cache:
                     del self.lru_cache[curr.node_id]
             assert curr.parent is not None
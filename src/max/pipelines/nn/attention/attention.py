@@ -120,6 +120,7 @@ class AttentionQKV(AttentionImplQKV):
 
         # Get attributes from inputs
         batch_size, seq_len = x.shape[0], x.shape[1]
+        layer_idx = ops.constant(self.layer_idx, DType.uint32)
 
         # Call into fused qkv matmul.
         xq = fused_qkv_matmul(
@@ -127,7 +128,7 @@ class AttentionQKV(AttentionImplQKV):
             input=x,
             wqkv=wqkv,
             kv_collection=kv_collection,
-            layer_idx=ops.constant(self.layer_idx, DType.uint32),
+            layer_idx=layer_idx,
             n_heads=self.n_heads,
         )
 
@@ -146,7 +147,7 @@ class AttentionQKV(AttentionImplQKV):
             self.kv_params,
             input=xq,
             kv_collection=kv_collection,
-            layer_idx=ops.constant(self.layer_idx, DType.uint32),
+            layer_idx=layer_idx,
             attention_mask=attention_mask,
             valid_lengths=kwargs["valid_lengths"],
             scale=self.scale,
@@ -103,10 +103,7 @@ class AttentionWithRope(AttentionImpl):
         # Apply rope.
         xq = xq.reshape((-1, self.n_heads, self.kv_params.head_dim))
 
-        if xq.device is not None:
-            freqs_cis = ops.cast(self.rope.freqs_cis, xq.dtype).to(xq.device)
-        else:
-            freqs_cis = ops.cast(self.rope.freqs_cis, xq.dtype)
+        freqs_cis = self.rope.freqs_cis_for(xq.dtype, xq.device)
 
         xq = fused_qk_ragged_rope(
             self.kv_params,
@@ -310,10 +307,7 @@ class AttentionWithRopeV2(LayerV2):
         # Apply rope.
         xq = xq.reshape((-1, self.n_heads, self.kv_params.head_dim))
 
-        if xq.device is not None:
-            freqs_cis = ops.cast(self.rope.freqs_cis, xq.dtype).to(xq.device)
-        else:
-            freqs_cis = ops.cast(self.rope.freqs_cis, xq.dtype)
+        freqs_cis = self.rope.freqs_cis_for(xq.dtype, xq.device)
 
         xq = fused_qk_ragged_rope(
             self.kv_params,
@@ -502,10 +496,7 @@ class GPTQAttentionWithRope(AttentionWithRopeV2):
         # Apply rope.
         xq = xq.reshape((-1, self.n_heads, self.kv_params.head_dim))
 
-        if xq.device is not None:
-            freqs_cis = ops.cast(self.rope.freqs_cis, xq.dtype).to(xq.device)
-        else:
-            freqs_cis = ops.cast(self.rope.freqs_cis, xq.dtype)
+        freqs_cis = self.rope.freqs_cis_for(xq.dtype, xq.device)
 
         xq = fused_qk_ragged_rope(
             self.kv_params,
@@ -592,9 +583,16 @@ class DistributedAttentionWithRope(
         **kwargs,
     ) -> List[TensorValue]:
         input_row_offsets = kwargs["input_row_offsets"]
-        assert isinstance(input_row_offsets, TensorValue)
         assert self.devices
-        input_row_offsets_ = distribute_value(input_row_offsets, self.devices)
+        # Callers running several layers may pass the offsets already
+        # distributed, one per device.
+        if isinstance(input_row_offsets, TensorValue):
+            input_row_offsets_ = distribute_value(
+                input_row_offsets, self.devices
+            )
+        else:
+            assert len(input_row_offsets) == len(self.devices)
+            input_row_offsets_ = input_row_offsets
         return self.allreduce(
             inputs=[
                 self.list_of_attentions[i](
@@ -626,6 +624,7 @@ class AttentionWithRopeQKV(AttentionImplQKV):
         # Get attributes from input.
         total_seq_len = x.shape[0]
 
+        layer_idx = ops.constant(self.layer_idx, DType.uint32)
         wqkv = ops.concat((self.wq, self.wk, self.wv))
 
         # Call into fused qkv ragged matmul.
@@ -635,7 +634,7 @@ class AttentionWithRopeQKV(AttentionImplQKV):
             wqkv=wqkv,
             input_row_offsets=kwargs["input_row_offsets"],
             kv_collection=kv_collection,
-            layer_idx=ops.constant(self.layer_idx, DType.uint32),
+            layer_idx=layer_idx,
             n_heads=self.n_heads,
         )
 
@@ -643,7 +642,7 @@ class AttentionWithRopeQKV(AttentionImplQKV):
         xq = xq.reshape((-1, self.n_heads, self.kv_params.head_dim))
 
         # Cast freqs_cis to xq's dtype to match the fused_qk_ragged_rope kernel.
-        freqs_cis = ops.cast(self.rope.freqs_cis, xq.dtype)
+        freqs_cis = self.rope.freqs_cis_for(xq.dtype)
 
         xq = fused_qk_ragged_rope(
             self.kv_params,
@@ -651,7 +650,7 @@ class AttentionWithRopeQKV(AttentionImplQKV):
             kwargs["input_row_offsets"],
             kv_collection,
             freqs_cis,
-            ops.constant(self.layer_idx, DType.uint32),
+            layer_idx,
             interleaved=self.rope.interleaved,
         )
 
@@ -660,7 +659,7 @@ class AttentionWithRopeQKV(AttentionImplQKV):
             self.kv_params,
             input=xq,
             kv_collection=kv_collection,
-            layer_idx=ops.constant(self.layer_idx, DType.uint32),
+            layer_idx=layer_idx,
             input_row_offsets=kwargs["input_row_offsets"],
             mask_variant=MHAMaskVariant.CAUSAL_MASK,
             scale=self.scale,
@@ -102,23 +102,23 @@ def compute_log_probabilities(
             log_probs, samples.reshape(-1, 1), axis=1
         ).reshape(-1)
 
-        # Store the stats for each sample token.
-        num_tokens = log_probs.shape[0]
-        token_log_probabilities = []
-        top_log_probabilities = []
-        for i in range(num_tokens):
-            token_log_probabilities.append(sampled_log_probs[i].item())
+        # Gather the top n log probabilities for every token at once.
+        top_n_log_probs = np.take_along_axis(log_probs, top_n_indices, axis=-1)
 
-            # Compute top n log probs.
-            top_tokens = {}
-            for n in range(top_n):
-                top_token = top_n_indices[i][n]
-                top_token_logits = log_probs[i][top_token]
-                top_tokens[top_token] = top_token_logits.item()
+        # Store the stats for each sample token. Converting with tolist()
+        # up front avoids a NumPy scalar round-trip per element.
+        token_log_probabilities = sampled_log_probs.tolist()
+        top_log_probabilities = []
+        for top_tokens_row, top_log_probs_row, sampled_token, sampled in zip(
+            top_n_indices.tolist(),
+            top_n_log_probs.tolist(),
+            samples.reshape(-1).tolist(),
+            token_log_probabilities,
+        ):
+            top_tokens = dict(zip(top_tokens_row, top_log_probs_row))
 
             # Include sampled token in the top tokens.
-            sampled_token = samples[i].item()
-            top_tokens[sampled_token] = sampled_log_probs[i].item()
+            top_tokens[sampled_token] = sampled
 
             top_log_probabilities.append(top_tokens)
 
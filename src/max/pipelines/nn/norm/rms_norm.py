@@ -36,7 +36,11 @@ class RMSNorm(Layer):
     def __call__(self, x: TensorValue) -> TensorValue:
         return ops.custom(
             "rms_norm",
-            [x, ops.cast(self.weight, x.dtype), ops.cast(self.eps, x.dtype)],
+            [
+                x,
+                ops.cast(self.weight, x.dtype),
+                ops.constant(self.eps, x.dtype),
+            ],
             [TensorType(dtype=x.dtype, shape=x.shape, device=x.device)],
         )[0].tensor
 
@@ -59,12 +63,14 @@ class RMSNormV2(LayerV2):
         self.eps = eps
 
     def __call__(self, x: TensorValue) -> TensorValue:
-        weight: TensorValue = ops.cast(self.weight, x.dtype)
+        weight = TensorValue(self.weight)
+        if weight.dtype != x.dtype:
+            weight = ops.cast(weight, x.dtype)
         if x.device:
             weight = weight.to(x.device)
         return ops.custom(
             "rms_norm",
-            [x, weight, ops.cast(self.eps, x.dtype)],
+            [x, weight, ops.constant(self.eps, x.dtype)],
             [TensorType(dtype=x.dtype, shape=x.shape, device=x.device)],
         )[0].tensor
 
@@ -13,12 +13,12 @@
 """The rope embedding used within the model."""
 
 import math
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import cached_property
 from typing import Optional
 
 from max.dtype import DType
-from max.graph import Dim, TensorValue, TensorValueLike, ops
+from max.graph import DeviceRef, Dim, TensorValue, TensorValueLike, ops
 
 from .layer import LayerV2
 
@@ -154,6 +154,10 @@ class OptimizedRotaryEmbedding(RotaryEmbedding):
     Optimized version of RotaryEmbedding using 2D frequency tensor representation.
     """
 
+    _freqs_cis_cast: list[tuple[DType, Optional[DeviceRef], TensorValue]] = (
+        field(default_factory=list, init=False, repr=False)
+    )
+
     @cached_property
     def freqs_cis(self):
         freqs = self.freqs_cis_base()
@@ -162,6 +166,24 @@ class OptimizedRotaryEmbedding(RotaryEmbedding):
         self._freqs_cis = ops.reshape(freqs, new_f_shape)
         return self._freqs_cis
 
+    def freqs_cis_for(
+        self, dtype: DType, device: Optional[DeviceRef] = None
+    ) -> TensorValue:
+        """Returns `freqs_cis` cast to `dtype` and moved to `device`.
+
+        Every attention layer sharing this embedding needs the same table, so
+        the cast and transfer are emitted once per (dtype, device) rather than
+        once per layer.
+        """
+        for cached_dtype, cached_device, freqs_cis in self._freqs_cis_cast:
+            if cached_dtype == dtype and cached_device == device:
+                return freqs_cis
+        freqs_cis = ops.cast(self.freqs_cis, dtype)
+        if device is not None:
+            freqs_cis = freqs_cis.to(device)
+        self._freqs_cis_cast.append((dtype, device, freqs_cis))
+        return freqs_cis
+
 
 @dataclass
 class Llama3RopeScalingParams:
@@ -121,8 +121,19 @@ class DistributedTransformer(LayerV2):
             for kv_cache_inputs in kv_cache_inputs_per_dev
         ]
 
+        # Every layer's attention needs the row offsets on each device. Move
+        # them once here rather than once per layer.
+        layer_kwargs = kwargs
+        if "input_row_offsets" in kwargs:
+            layer_kwargs = {
+                **kwargs,
+                "input_row_offsets": distribute_value(
+                    kwargs["input_row_offsets"], self.devices
+                ),
+            }
+
         for _, layer in enumerate(self.layers):
-            h = layer(h, signal_buffers, kv_collections, **kwargs)
+            h = layer(h, signal_buffers, kv_collections, **layer_kwargs)
 
         h0 = h[0]  # All the outputs are the same here.
         if self.all_logits:
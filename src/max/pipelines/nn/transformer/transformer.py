@@ -136,23 +136,26 @@ class Transformer(LayerV2):
         for _, layer in enumerate(self.layers):
             h = layer(h, kv_collection, **kwargs)
 
-        normalized = self.norm(h)
-
+        # The norm is applied per row, so the last token of each sequence
+        # can be gathered first and normalized on its own.
         if "input_row_offsets" in kwargs:
             # Ragged inputs/activations
             last_indices = kwargs["input_row_offsets"][1:] - 1
-            last_tokens = ops.gather(normalized, last_indices, axis=0)
+            last_tokens = ops.gather(h, last_indices, axis=0)
         else:
             # Dense padded inputs/activations
             valid_lengths = kwargs["valid_lengths"]
             # TODO: Remove once `gather_nd` works with nonstatic last dims.
             indices = ops.unsqueeze(valid_lengths - 1, -1)
-            last_tokens = ops.gather_nd(normalized, indices, batch_dims=1)
+            last_tokens = ops.gather_nd(h, indices, batch_dims=1)
+
+        last_tokens = self.norm(last_tokens)
 
         # Always return float32 logits, no matter the activation type.
         last_token_logits = ops.cast(self.lm_head(last_tokens), DType.float32)
 
         if self.all_logits:
+            normalized = self.norm(h)
             all_logits = ops.cast(self.lm_head(normalized), DType.float32)
             return self._apply_logits_postprocessor(
                 (last_token_logits, all_logits)
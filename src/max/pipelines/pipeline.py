@@ -15,10 +15,17 @@
 
 from __future__ import annotations
 
+import hashlib
+import importlib.metadata
 import logging
+import os
+import sys
+import tempfile
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from pathlib import Path
 from typing import (
+    Any,
     Generic,
     Optional,
     Protocol,
@@ -31,7 +38,9 @@ from typing import (
 import torch
 from max.driver import Device, Tensor, load_devices
 from max.dtype import DType
-from max.engine import InferenceSession
+from max.engine import InferenceSession, Model
+from max.graph import StaticDim, TensorType
+from max.graph.weights import Weights
 from max.pipelines.kv_cache import (
     KVCacheInputs,
     KVCacheInputsSequence,
@@ -67,6 +76,14 @@ except ImportError:
 
 logger = logging.getLogger("max.pipelines")
 
+# Directory holding compiled models cached by earlier processes when
+# `PipelineConfig.cache_compiled_model` is enabled.
+_COMPILED_MODEL_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "modular"
+    / "compiled_models"
+)
+
 ARCH_SAFE_VRAM_USAGE_LIMIT = {
     "DeepseekCoder": 0.96,
     "ExaoneForCausalLM": 0.96,
@@ -353,6 +370,145 @@ class PipelineModel(ABC, Generic[T]):
             f"Log probabilities not implemented for {type(self)}."
         )
 
+    def _compiled_model_cache_path(
+        self, name: str, key_parts: Sequence[Any] = ()
+    ) -> Path | None:
+        """Returns where the compiled model for this configuration is cached.
+
+        The key covers the MAX version, the target devices, the Hugging Face
+        config, the encoding, the weight files (with size and modification
+        time when they are local), and the source of the architecture package
+        that builds the graph, plus any model specific `key_parts` that change
+        the built graph.
+
+        Returns None if `cache_compiled_model` is disabled, or if the MAX
+        version can't be determined, since a serialized model isn't portable
+        across versions.
+        """
+        if not self.pipeline_config.cache_compiled_model:
+            return None
+        try:
+            max_version = importlib.metadata.version("max")
+        except importlib.metadata.PackageNotFoundError:
+            return None
+
+        parts: list[Any] = [
+            max_version,
+            self.pipeline_config.device_specs,
+            self.huggingface_config.to_json_string(),
+            self.encoding,
+            self.pipeline_config.model_path,
+            self.pipeline_config.huggingface_revision,
+            *key_parts,
+        ]
+        for device in self.devices:
+            parts.append(device.label)
+            # Kernels are compiled for a specific GPU architecture.
+            if device.label == "gpu" and torch.cuda.is_available():
+                parts.append(torch.cuda.get_device_name(device.id))
+                parts.append(torch.cuda.get_device_capability(device.id))
+        for weight_path in self.pipeline_config.weight_path:
+            parts.append(weight_path)
+            if weight_path.exists():
+                stat = weight_path.stat()
+                parts.extend((stat.st_size, stat.st_mtime_ns))
+
+        key = hashlib.blake2b(digest_size=8)
+        for part in parts:
+            key.update(str(part).encode())
+        # Fingerprint the graph by the code that builds it, so that editing
+        # the architecture never loads a model compiled from the old code.
+        module_file = sys.modules[type(self).__module__].__file__
+        if module_file is not None:
+            for source_path in sorted(Path(module_file).parent.glob("*.py")):
+                key.update(source_path.read_bytes())
+        return _COMPILED_MODEL_CACHE_DIR / f"{name}-{key.hexdigest()}.mef"
+
+    def _load_cached_compiled_model(
+        self,
+        session: InferenceSession,
+        cache_path: Path,
+        weights: Weights,
+        input_types: Sequence[TensorType],
+    ) -> Model | None:
+        """Loads a model cached by `_cache_compiled_model`.
+
+        Returns None if nothing is cached at `cache_path`. A cached model that
+        fails to load, or whose inputs don't match `input_types`, is deleted
+        so that it is recompiled and replaced.
+        """
+        if not cache_path.exists():
+            return None
+
+        # Hydrate all weights to be referenced by the serialized model.
+        weights_registry = {}
+        for name, weight in weights.items():
+            weights_registry[name] = weight.raw_tensor()
+
+        logger.info("Loading cached compiled model from %s", cache_path)
+        try:
+            model = session.load(
+                str(cache_path), weights_registry=weights_registry
+            )
+        except Exception as e:
+            logger.warning(
+                "Unable to load cached compiled model from %s, recompiling: %s",
+                cache_path,
+                e,
+            )
+            cache_path.unlink(missing_ok=True)
+            return None
+
+        if not _inputs_match(model, input_types):
+            logger.warning(
+                "Cached compiled model at %s has unexpected inputs, recompiling",
+                cache_path,
+            )
+            cache_path.unlink(missing_ok=True)
+            return None
+        return model
+
+    def _cache_compiled_model(self, model: Model, cache_path: Path) -> None:
+        """Saves `model` to `cache_path` for `_load_cached_compiled_model`.
+
+        The model is exported to a temporary file and renamed into place, so a
+        crash or a concurrent process never leaves a partial cache entry.
+        Failures are logged rather than raised.
+        """
+        tmp_path = None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=cache_path.parent, prefix=f"{cache_path.stem}-"
+            )
+            os.close(fd)
+            model._export_mef(tmp_path)
+            os.replace(tmp_path, cache_path)
+            tmp_path = None
+        except Exception as e:
+            logger.warning(
+                "Unable to cache compiled model at %s: %s", cache_path, e
+            )
+        finally:
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+
+
+def _inputs_match(model: Model, input_types: Sequence[TensorType]) -> bool:
+    """Returns whether `model` takes inputs of `input_types`.
+
+    Dtypes and ranks must match, as must every static dimension.
+    """
+    if len(model.input_metadata) != len(input_types):
+        return False
+    for spec, input_type in zip(model.input_metadata, input_types):
+        if spec.dtype != input_type.dtype or len(spec.shape) != input_type.rank:
+            return False
+        for spec_dim, dim in zip(spec.shape, input_type.shape):
+            if isinstance(dim, StaticDim) and spec_dim != dim.dim:
+                return False
+    return True
+
 
 @runtime_checkable
 class KVCacheMixin(Protocol):